@@ -9,16 +9,22 @@ __authoremail__ = "vangils.dennis@gmail.com"
 __url__ = "https://github.com/Dennis-van-Gils/project-Humidistat"
 __date__ = "28-07-2022"
 __version__ = "1.1"
-# pylint: disable=bare-except, broad-except, unnecessary-lambda
+# pylint: disable=bare-except, broad-except
 
+import os
 from pathlib import Path
 from configparser import ConfigParser
+from functools import lru_cache
+from io import StringIO
+from operator import attrgetter
+from types import MappingProxyType
 
 from PyQt5 import QtCore, QtGui
 from PyQt5.QtCore import QDateTime
 from PyQt5.QtWidgets import (
     QCheckBox,
     QFileDialog,
+    QGraphicsItem,
     QGridLayout,
     QGroupBox,
     QHBoxLayout,
@@ -48,15 +54,23 @@ from humidistat_qdev import Humidistat_qdev, ControlMode, ControlBand
 
 
 # Constants
-UPDATE_INTERVAL_WALL_CLOCK = 50  # 50 [ms]
+UPDATE_INTERVAL_WALL_CLOCK = 250  # 250 [ms]
+UPDATE_INTERVAL_CHARTS = 200  # Maximum redraw rate of the charts [ms]
 CHART_HISTORY_TIME = 7200  # Maximum history length of charts [s]
+DAQ_INTERVAL_MS = 1000  # Must match `DAQ_PERIOD` of the Arduino firmware [ms]
 DEFAULT_CONFIG_FILE = "./config/humidistat_default_config.ini"
 
 # Show debug info in terminal? Warning: Slow! Do not leave on unintentionally.
 DEBUG = False
 
-# Try OpenGL support
-TRY_USING_OPENGL = True
+# Antialias the charts? Smoother looking, but much slower to draw, especially
+# for pens wider than 1 pixel without OpenGL (see pyqtgraph issue #533).
+ANTIALIAS = False
+
+# Try OpenGL support. Can be overridden per machine by setting the environment
+# variable `HUMIDISTAT_USE_OPENGL=0`, as some graphics drivers render slower or
+# with glitches through OpenGL than through the default raster painter.
+TRY_USING_OPENGL = os.environ.get("HUMIDISTAT_USE_OPENGL", "1") != "0"
 if TRY_USING_OPENGL:
     try:
         import OpenGL.GL as gl  # pylint: disable=unused-import
@@ -66,28 +80,77 @@ if TRY_USING_OPENGL:
     else:
         print("OpenGL acceleration: Enabled")
         pg.setConfigOptions(useOpenGL=True)
-        pg.setConfigOptions(antialias=True)
         pg.setConfigOptions(enableExperimental=True)
 
+        # Do not let the buffer swaps of the charts wait for the vertical sync
+        from PyQt5.QtOpenGL import QGLFormat
+
+        fmt = QGLFormat.defaultFormat()
+        fmt.setSwapInterval(0)
+        QGLFormat.setDefaultFormat(fmt)
+
 # Default settings for graphs
 # pg.setConfigOptions(leftButtonPan=False)
 pg.setConfigOption("background", controls.COLOR_GRAPH_BG)
 pg.setConfigOption("foreground", controls.COLOR_GRAPH_FG)
+pg.setConfigOption("antialias", ANTIALIAS)
 
 
 # ------------------------------------------------------------------------------
 #   Custom plotting styles
 # ------------------------------------------------------------------------------
 
+# Thick pens are only cheap to draw using OpenGL. The raster painter falls back
+# to a very slow path for lines wider than 1 pixel.
+PEN_WIDTH = 3 if pg.getConfigOption("useOpenGL") else 1
+PEN_01 = pg.mkPen(controls.COLOR_PEN_TURQUOISE, width=PEN_WIDTH)
+PEN_02 = pg.mkPen(controls.COLOR_PEN_YELLOW, width=PEN_WIDTH)
+PEN_03 = pg.mkPen(controls.COLOR_PEN_PINK, width=PEN_WIDTH)
+PEN_04 = pg.mkPen(controls.COLOR_PEN_PINK, width=1, style=QtCore.Qt.DotLine)
+
+P_TITLE = MappingProxyType(
+    {
+        "color": controls.COLOR_GRAPH_FG.name(),
+        "font-size": "12pt",
+        "font-family": "Helvetica",
+        "font-weight": "bold",
+    }
+)
+P_LABEL = MappingProxyType(
+    {
+        "color": controls.COLOR_GRAPH_FG.name(),
+        "font-size": "12pt",
+        "font-family": "Helvetica",
+    }
+)
+
+
+@lru_cache(maxsize=None)
+def tick_font() -> QtGui.QFont:
+    """Font shared by the tick labels of all plot axes. Created lazily, because
+    a `QFont` needs the `QApplication` to exist first.
+    """
+    font = QtGui.QFont()
+    font.setPixelSize(16)
+    return font
+
+
+@lru_cache(maxsize=None)
+def average_char_width() -> int:
+    """Average character width of the default application font [px]"""
+    return QtGui.QFontMetrics(QtGui.QFont()).averageCharWidth()
+
 
 class CustomAxis(pg.AxisItem):
     """Aligns the top label of a `pyqtgraph.PlotItem` plot to the top-left
     corner
     """
 
+    _ZERO = QtCore.QPointF(0, 0)
+
     def resizeEvent(self, ev=None):
-        if self.orientation == "top":
-            self.label.setPos(QtCore.QPointF(0, 0))
+        if self.orientation == "top" and self.label.pos() != self._ZERO:
+            self.label.setPos(self._ZERO)
 
 
 def apply_PlotItem_style(
@@ -100,6 +163,9 @@ def apply_PlotItem_style(
     """Apply our custom stylesheet to a `pyqtgraph.PlotItem` plot"""
 
     pi.setClipToView(True)
+    # Draw only a few points per pixel column when zoomed out, while preserving
+    # the peaks. Gets passed on to each curve added by `pi.plot()`.
+    pi.setDownsampling(auto=True, mode="peak")
     pi.showGrid(x=1, y=1)
     pi.setMenuEnabled(True)
     pi.enableAutoRange(axis=pg.ViewBox.XAxis, enable=False)
@@ -108,49 +174,75 @@ def apply_PlotItem_style(
     pi.setRange(xRange=[-CHART_HISTORY_TIME, 0])
     pi.vb.setLimits(xMax=0.01)
 
-    p_title = {
-        "color": controls.COLOR_GRAPH_FG.name(),
-        "font-size": "12pt",
-        "font-family": "Helvetica",
-        "font-weight": "bold",
-    }
-    p_label = {
-        "color": controls.COLOR_GRAPH_FG.name(),
-        "font-size": "12pt",
-        "font-family": "Helvetica",
-    }
-    pi.setLabel("bottom", bottom, **p_label)
-    pi.setLabel("left", left, **p_label)
-    pi.setLabel("top", title, **p_title)
-    pi.setLabel("right", right, **p_label)
+    pi.setLabel("bottom", bottom, **P_LABEL)
+    pi.setLabel("left", left, **P_LABEL)
+    pi.setLabel("top", title, **P_TITLE)
+    pi.setLabel("right", right, **P_LABEL)
 
-    # fmt: off
-    font = QtGui.QFont()
-    font.setPixelSize(16)
-    pi.getAxis("bottom").setTickFont(font)
-    pi.getAxis("left")  .setTickFont(font)
-    pi.getAxis("top")   .setTickFont(font)
-    pi.getAxis("right") .setTickFont(font)
+    ax_bottom = pi.getAxis("bottom")
+    ax_left = pi.getAxis("left")
+    ax_top = pi.getAxis("top")
+    ax_right = pi.getAxis("right")
 
-    pi.getAxis("bottom").setStyle(tickTextOffset=10)
-    pi.getAxis("left")  .setStyle(tickTextOffset=10)
+    font = tick_font()
+    for ax in (ax_bottom, ax_left, ax_top, ax_right):
+        ax.setTickFont(font)
 
-    pi.getAxis("bottom").setHeight(60)
-    pi.getAxis("left")  .setWidth(90)
-    pi.getAxis("top")   .setHeight(40)
-    pi.getAxis("right") .setWidth(16)
+    # fmt: off
+    ax_bottom.setStyle(tickTextOffset=10)
+    ax_left  .setStyle(tickTextOffset=10)
 
-    pi.getAxis("top")  .setStyle(showValues=False)
-    pi.getAxis("right").setStyle(showValues=False)
+    ax_bottom.setHeight(60)
+    ax_left  .setWidth(90)
+    ax_top   .setHeight(40)
+    ax_right .setWidth(16)
+
+    ax_top  .setStyle(showValues=False)
+    ax_right.setStyle(showValues=False)
     # fmt: on
 
 
+# ------------------------------------------------------------------------------
+#   Configuration files
+# ------------------------------------------------------------------------------
+
+# Fields of `Humidistat_qdev.Config` that get stored in the [Humidistat] section
+# of the configuration file: (option name, attribute path, type)
+# fmt: off
+CONFIG_FIELDS = (
+    ("actors_incr_RH_ENA_valve_1", "actors_incr_RH.ENA_valve_1", bool),
+    ("actors_incr_RH_ENA_valve_2", "actors_incr_RH.ENA_valve_2", bool),
+    ("actors_incr_RH_ENA_pump"   , "actors_incr_RH.ENA_pump"   , bool),
+    ("actors_decr_RH_ENA_valve_1", "actors_decr_RH.ENA_valve_1", bool),
+    ("actors_decr_RH_ENA_valve_2", "actors_decr_RH.ENA_valve_2", bool),
+    ("actors_decr_RH_ENA_pump"   , "actors_decr_RH.ENA_pump"   , bool),
+    ("act_on_sensor_no"          , "act_on_sensor_no"          , int),
+    ("fineband_dHI"              , "fineband_dHI"              , float),
+    ("fineband_dLO"              , "fineband_dLO"              , float),
+    ("deadband_dHI"              , "deadband_dHI"              , float),
+    ("deadband_dLO"              , "deadband_dLO"              , float),
+    ("band_hysteresis"           , "band_hysteresis"           , float),
+    ("burst_update_period"       , "burst_update_period"       , int),
+    ("burst_incr_RH_length"      , "burst_incr_RH_length"      , int),
+    ("burst_decr_RH_length"      , "burst_decr_RH_length"      , int),
+)
+# fmt: on
+
+# Options that got added later on and can be missing from older configuration
+# files. These keep their current value when absent.
+CONFIG_OPTIONAL = ("band_hysteresis",)
+
+
 # ------------------------------------------------------------------------------
 #   MainWindow
 # ------------------------------------------------------------------------------
 
 
 class MainWindow(QWidget):
+    # Options for the file dialogs of the configuration files
+    FILE_DIALOG_OPTIONS = QFileDialog.Options()
+    # FILE_DIALOG_OPTIONS |= QFileDialog.DontUseNativeDialog
+
     def __init__(
         self,
         ard: Arduino,
@@ -165,8 +257,11 @@ class MainWindow(QWidget):
         self.ard_qdev = ard_qdev
         self.logger = logger
 
-        # Shorthands
-        state = self.ard_qdev.state
+        # Last text written to each widget by `setText_if_changed()`
+        self._last_text = {}
+
+        # Epoch second last shown by `update_wall_clock()`
+        self._wall_clock_secs = -1
 
         self.setWindowTitle("Humidistat")
         self.setGeometry(350, 60, 1200, 900)
@@ -177,8 +272,8 @@ class MainWindow(QWidget):
         )
 
         # Textbox widths for fitting N characters using the current font
-        ex8 = 8 + 8 * QtGui.QFontMetrics(QtGui.QFont()).averageCharWidth()
-        ex10 = 8 + 10 * QtGui.QFontMetrics(QtGui.QFont()).averageCharWidth()
+        ex8 = 8 + 8 * average_char_width()
+        ex10 = 8 + 10 * average_char_width()
 
         # -------------------------
         #   Top frame
@@ -207,9 +302,7 @@ class MainWindow(QWidget):
         self.qpbt_record = controls.create_Toggle_button(
             "Click to start recording to file"
         )
-        self.qpbt_record.clicked.connect(
-            lambda state: self.logger.record(state)
-        )
+        self.qpbt_record.clicked.connect(self.logger.record)
 
         vbox_middle = QVBoxLayout()
         vbox_middle.addWidget(self.qlbl_title)
@@ -269,18 +362,9 @@ class MainWindow(QWidget):
         self.plots = [self.pi_temp, self.pi_humi, self.pi_pres]
 
         # Thread-safe curves
-        capacity = round(
-            CHART_HISTORY_TIME * 1e3 / ard_qdev.worker_DAQ._DAQ_interval_ms
-        )  # TODO: Fix this wrong calculation. `_DAQ_interval_ms` is not the
-        # correct variable anymore. DAQ interval is rather determined on the
-        # Arduino side.
-        PEN_01 = pg.mkPen(controls.COLOR_PEN_TURQUOISE, width=3)
-        PEN_02 = pg.mkPen(controls.COLOR_PEN_YELLOW, width=3)
-        PEN_03 = pg.mkPen(controls.COLOR_PEN_PINK, width=3)
-        PEN_04 = pg.mkPen(
-            controls.COLOR_PEN_PINK, width=1, style=QtCore.Qt.DotLine
-        )
-
+        # The Arduino reports once every `DAQ_INTERVAL_MS` and additionally on
+        # each actuator change. Leave headroom for the latter.
+        capacity = round(1.5 * CHART_HISTORY_TIME * 1e3 / DAQ_INTERVAL_MS)
         self.curve_setpoint = HistoryChartCurve(  # Setpoint
             capacity=capacity,
             linked_curve=self.pi_humi.plot(pen=PEN_03, name=""),
@@ -335,17 +419,22 @@ class MainWindow(QWidget):
         ]
         self.curves = self.curves_setpoint + self.curves_1 + self.curves_2
 
+        # Performance boost for the raster painter: Keep the rendered curves
+        # cached as pixmaps, so that repaints not caused by new data become a
+        # cheap blit. Not applicable to the OpenGL viewport.
+        if not pg.getConfigOption("useOpenGL"):
+            for curve in self.curves:
+                curve.curve.curve.setCacheMode(
+                    QGraphicsItem.DeviceCoordinateCache
+                )
+
         #  Group `Readings`
         # -------------------------
 
         legend_1 = LegendSelect(linked_curves=self.curves_1)
         legend_2 = LegendSelect(linked_curves=self.curves_2)
-        legend_1.qpbt_toggle.clicked.connect(
-            lambda: QtCore.QCoreApplication.processEvents()  # Force redraw
-        )
-        legend_2.qpbt_toggle.clicked.connect(
-            lambda: QtCore.QCoreApplication.processEvents()  # Force redraw
-        )
+        legend_1.qpbt_toggle.clicked.connect(self.redraw_charts)
+        legend_2.qpbt_toggle.clicked.connect(self.redraw_charts)
 
         p = {
             "readOnly": True,
@@ -473,15 +562,9 @@ class MainWindow(QWidget):
 
         self.qlin_setpoint.editingFinished.connect(self.process_qlin_setpoint)
         self.qpbt_control_mode.clicked.connect(self.process_qpbt_control_mode)
-        self.qpbt_valve_1.clicked.connect(
-            lambda: ard_qdev.set_valve_1(not state.valve_1)
-        )
-        self.qpbt_valve_2.clicked.connect(
-            lambda: ard_qdev.set_valve_2(not state.valve_2)
-        )
-        self.qpbt_pump.clicked.connect(
-            lambda: ard_qdev.set_pump(not state.pump)
-        )
+        self.qpbt_valve_1.clicked.connect(ard_qdev.toggle_valve_1)
+        self.qpbt_valve_2.clicked.connect(ard_qdev.toggle_valve_2)
+        self.qpbt_pump.clicked.connect(ard_qdev.toggle_pump)
         self.qpbt_burst_incr_RH.clicked.connect(ard_qdev.burst_incr_RH)
         self.qpbt_burst_decr_RH.clicked.connect(ard_qdev.burst_decr_RH)
         self.qpbt_reconnect.clicked.connect(ard_qdev.reconnect_BME280_sensors)
@@ -491,13 +574,7 @@ class MainWindow(QWidget):
         )
 
         # Show/hide dead-band curves when clicking setpoint checkbox
-        def curves_deadband_setVisible(flag: bool):
-            self.curve_deadband_HI.setVisible(flag)
-            self.curve_deadband_LO.setVisible(flag)
-
-        legend_setpoint.chkbs[0].clicked.connect(
-            lambda checked: curves_deadband_setVisible(checked)
-        )
+        legend_setpoint.chkbs[0].clicked.connect(self.process_qchk_setpoint)
 
         # fmt: off
         i = 0
@@ -569,6 +646,7 @@ class MainWindow(QWidget):
         self.qlin_fineband_dLO = QLineEdit(**p)
         self.qlin_deadband_dHI = QLineEdit(**p)
         self.qlin_deadband_dLO = QLineEdit(**p)
+        self.qlin_band_hysteresis = QLineEdit(**p)
         self.qlin_burst_update_period = QLineEdit(**p)
         self.qlin_burst_incr_RH_length = QLineEdit(**p)
         self.qlin_burst_decr_RH_length = QLineEdit(**p)
@@ -585,6 +663,9 @@ class MainWindow(QWidget):
         self.qlin_deadband_dLO.editingFinished.connect(
             self.process_qlin_deadband_dLO
         )
+        self.qlin_band_hysteresis.editingFinished.connect(
+            self.process_qlin_band_hysteresis
+        )
         self.qlin_burst_update_period.editingFinished.connect(
             self.process_qlin_burst_update_period
         )
@@ -600,15 +681,9 @@ class MainWindow(QWidget):
         self.qpbt_dflt_config = QPushButton(
             "Save as default", maximumWidth=ex8 * 2
         )
-        self.qpbt_load_config.clicked.connect(
-            lambda: self.load_config_from_file(from_default=False)
-        )
-        self.qpbt_save_config.clicked.connect(
-            lambda: self.save_config_to_file(as_default=False)
-        )
-        self.qpbt_dflt_config.clicked.connect(
-            lambda: self.save_config_to_file(as_default=True)
-        )
+        self.qpbt_load_config.clicked.connect(self.process_qpbt_load_config)
+        self.qpbt_save_config.clicked.connect(self.process_qpbt_save_config)
+        self.qpbt_dflt_config.clicked.connect(self.process_qpbt_dflt_config)
 
         grid3 = QGridLayout(spacing=4)
         grid3.addWidget(QLabel("<b>Configuration</b>"), 0, 0, 1, 3)
@@ -628,6 +703,9 @@ class MainWindow(QWidget):
         grid2.addWidget(self.qlin_deadband_dLO             , i, 1)
         grid2.addWidget(self.qlin_deadband_dHI             , i, 2)
         grid2.addWidget(QLabel("% RH")                     , i, 3)      ; i+=1
+        grid2.addWidget(QLabel("Hysteresis:")              , i, 0, 1, 2)
+        grid2.addWidget(self.qlin_band_hysteresis          , i, 2)
+        grid2.addWidget(QLabel("% RH")                     , i, 3)      ; i+=1
         grid2.addItem(QSpacerItem(0, 6)                    , i, 0)      ; i+=1
         grid2.addWidget(QLabel("<b>Fine-band bursts</b>")  , i, 0, 1, 3); i+=1
         grid2.addWidget(QLabel("Update period:")           , i, 0, 1, 2)
@@ -705,19 +783,33 @@ class MainWindow(QWidget):
         self.timer_wall_clock.timeout.connect(self.update_wall_clock)
         self.timer_wall_clock.start(UPDATE_INTERVAL_WALL_CLOCK)
 
+        # -------------------------
+        #   Charts timer
+        # -------------------------
+
+        # Redraw the charts at a capped rate, decoupled from the DAQ rate
+        self._charts_dirty = False
+        self.timer_charts = QtCore.QTimer()
+        self.timer_charts.timeout.connect(self.update_charts)
+        self.timer_charts.start(UPDATE_INTERVAL_CHARTS)
+
         # -------------------------
         #   Connect external signals
         # -------------------------
 
-        self.ard_qdev.signal_DAQ_updated.connect(self.update_GUI)
+        # The DAQ worker emits from another thread. Bursts of emissions get
+        # coalesced into a single `update_GUI()`, as only the latest state
+        # matters for display.
+        self._update_GUI_pending = False
+        self.ard_qdev.signal_DAQ_updated.connect(
+            self.schedule_update_GUI, QtCore.Qt.QueuedConnection
+        )
 
         self.logger.signal_recording_started.connect(
-            lambda filepath: self.qpbt_record.setText(
-                "Recording to file: %s" % filepath
-            )
+            self.process_recording_started
         )
         self.logger.signal_recording_stopped.connect(
-            lambda: self.qpbt_record.setText("Click to start recording to file")
+            self.process_recording_stopped
         )
 
     # --------------------------------------------------------------------------
@@ -726,52 +818,115 @@ class MainWindow(QWidget):
 
     @QtCore.pyqtSlot()
     def update_wall_clock(self):
+        # The label only changes once per second. Skip the formatting and
+        # repaint otherwise.
         cur_date_time = QDateTime.currentDateTime()
+        secs = cur_date_time.toSecsSinceEpoch()
+        if secs == self._wall_clock_secs:
+            return
+
+        self._wall_clock_secs = secs
         self.qlbl_cur_date_time.setText(
-            "%s    %s"
-            % (
-                cur_date_time.toString("dd-MM-yyyy"),
-                cur_date_time.toString("HH:mm:ss"),
-            )
+            cur_date_time.toString("dd-MM-yyyy    HH:mm:ss")
         )
 
+    def setText_if_changed(self, widget, text: str):
+        """Only call `widget.setText()` when the text differs from the text
+        that was last written to it, preventing needless repaints"""
+        if self._last_text.get(widget) != text:
+            widget.setText(text)
+            self._last_text[widget] = text
+
+    def changeEvent(self, event):
+        # Catch up on the skipped GUI updates as soon as the window gets
+        # restored from being minimized
+        if (
+            event.type() == QtCore.QEvent.WindowStateChange
+            and not self.isMinimized()
+        ):
+            self.schedule_update_GUI()
+        super().changeEvent(event)
+
+    @QtCore.pyqtSlot()
+    def schedule_update_GUI(self):
+        if not self._update_GUI_pending:
+            self._update_GUI_pending = True
+            QtCore.QTimer.singleShot(0, self.update_GUI)
+
     @QtCore.pyqtSlot()
     def update_GUI(self):
+        self._update_GUI_pending = False
+
+        # Nothing to show when the window is hidden or minimized. The chart
+        # curves keep receiving their data from the DAQ worker regardless.
+        if not self.isVisible() or self.isMinimized():
+            return
+
         # Shorthands
         ard_qdev = self.ard_qdev
         state = self.ard_qdev.state
 
-        self.qlbl_update_counter.setText("%i" % ard_qdev.update_counter_DAQ)
-        self.qlbl_DAQ_rate.setText(
-            "DAQ: %.1f Hz" % ard_qdev.obtained_DAQ_rate_Hz
+        set_text = self.setText_if_changed
+
+        self.qlbl_update_counter.setNum(ard_qdev.update_counter_DAQ)
+        set_text(
+            self.qlbl_DAQ_rate, f"DAQ: {ard_qdev.obtained_DAQ_rate_Hz:.1f} Hz"
         )
         if self.logger.is_recording():
-            self.qlbl_recording_time.setText(
-                "REC: %s" % self.logger.pretty_elapsed()
+            set_text(
+                self.qlbl_recording_time,
+                f"REC: {self.logger.pretty_elapsed()}",
             )
         else:
-            self.qlbl_recording_time.setText("")
-
-        self.qlin_humi_1.setText("%.1f" % state.humi_1)
-        self.qlin_temp_1.setText("%.1f" % state.temp_1)
-        self.qlin_pres_1.setText("%.0f" % state.pres_1)
-        self.qlin_humi_2.setText("%.1f" % state.humi_2)
-        self.qlin_temp_2.setText("%.1f" % state.temp_2)
-        self.qlin_pres_2.setText("%.0f" % state.pres_2)
-
-        if state.control_band == ControlBand.Coarse:
-            self.qlin_control_band.setText("COARSE")
-        elif state.control_band == ControlBand.Fine:
-            self.qlin_control_band.setText("FINE")
-        elif state.control_band == ControlBand.Dead:
-            self.qlin_control_band.setText("DEAD")
-
-        self.qpbt_valve_1.setChecked(state.valve_1)
-        self.qpbt_valve_1.setText("ON" if state.valve_1 else "OFF")
-        self.qpbt_valve_2.setChecked(state.valve_2)
-        self.qpbt_valve_2.setText("ON" if state.valve_2 else "OFF")
-        self.qpbt_pump.setChecked(state.pump)
-        self.qpbt_pump.setText("ON" if state.pump else "OFF")
+            set_text(self.qlbl_recording_time, "")
+        set_text(self.qlin_humi_1, f"{state.humi_1:.1f}")
+        set_text(self.qlin_temp_1, f"{state.temp_1:.1f}")
+        set_text(self.qlin_pres_1, f"{state.pres_1:.0f}")
+        set_text(self.qlin_humi_2, f"{state.humi_2:.1f}")
+        set_text(self.qlin_temp_2, f"{state.temp_2:.1f}")
+        set_text(self.qlin_pres_2, f"{state.pres_2:.0f}")
+
+        control_band = state.control_band
+        if control_band == ControlBand.Coarse:
+            set_text(self.qlin_control_band, "COARSE")
+        elif control_band == ControlBand.Fine:
+            set_text(self.qlin_control_band, "FINE")
+        elif control_band == ControlBand.Dead:
+            set_text(self.qlin_control_band, "DEAD")
+
+        # Always (re)apply the checked states, because a click on a toggle
+        # button flips it locally even when the Arduino ends up overruling it.
+        # Qt ignores a `setChecked()` that does not change anything.
+        valve_1 = state.valve_1
+        valve_2 = state.valve_2
+        pump = state.pump
+        self.qpbt_valve_1.setChecked(valve_1)
+        self.qpbt_valve_2.setChecked(valve_2)
+        self.qpbt_pump.setChecked(pump)
+
+        set_text(self.qpbt_valve_1, "ON" if valve_1 else "OFF")
+        set_text(self.qpbt_valve_2, "ON" if valve_2 else "OFF")
+        set_text(self.qpbt_pump, "ON" if pump else "OFF")
+
+        # The charts get redrawn by `update_charts()`
+        self._charts_dirty = True
+
+    @QtCore.pyqtSlot()
+    def redraw_charts(self):
+        """Schedule a repaint of the charts, e.g. after toggling curves"""
+        for plot in self.plots:
+            plot.vb.update()
+
+    @QtCore.pyqtSlot()
+    def update_charts(self):
+        # While the charts are not on screen the dirty flag is left set, so
+        # that they get redrawn as soon as they are shown again
+        if not self._charts_dirty:
+            return
+        if not self.gw.isVisible() or self.isMinimized():
+            return
+
+        self._charts_dirty = False
 
         if DEBUG:
             tprint("update_charts")
@@ -785,7 +940,7 @@ class MainWindow(QWidget):
         state = self.ard_qdev.state
         config = self.ard_qdev.config
 
-        self.qlin_setpoint.setText("%u" % state.setpoint)
+        self.qlin_setpoint.setText(f"{state.setpoint:d}")
 
         self.qchk_incr_ENA_valve_1.setChecked(config.actors_incr_RH.ENA_valve_1)
         self.qchk_incr_ENA_valve_2.setChecked(config.actors_incr_RH.ENA_valve_2)
@@ -798,16 +953,17 @@ class MainWindow(QWidget):
         self.qrbt_act_on_sensor_1.setChecked(config.act_on_sensor_no == 1)
         self.qrbt_act_on_sensor_2.setChecked(config.act_on_sensor_no == 2)
 
-        self.qlin_fineband_dHI.setText("%+.1f" % config.fineband_dHI)
-        self.qlin_fineband_dLO.setText("%+.1f" % config.fineband_dLO)
-        self.qlin_deadband_dHI.setText("%+.1f" % config.deadband_dHI)
-        self.qlin_deadband_dLO.setText("%+.1f" % config.deadband_dLO)
-        self.qlin_burst_update_period.setText("%u" % config.burst_update_period)
+        self.qlin_fineband_dHI.setText(f"{config.fineband_dHI:+.1f}")
+        self.qlin_fineband_dLO.setText(f"{config.fineband_dLO:+.1f}")
+        self.qlin_deadband_dHI.setText(f"{config.deadband_dHI:+.1f}")
+        self.qlin_deadband_dLO.setText(f"{config.deadband_dLO:+.1f}")
+        self.qlin_band_hysteresis.setText(f"{config.band_hysteresis:.1f}")
+        self.qlin_burst_update_period.setText(f"{config.burst_update_period:d}")
         self.qlin_burst_incr_RH_length.setText(
-            "%u" % config.burst_incr_RH_length
+            f"{config.burst_incr_RH_length:d}"
         )
         self.qlin_burst_decr_RH_length.setText(
-            "%u" % config.burst_decr_RH_length
+            f"{config.burst_decr_RH_length:d}"
         )
 
     # --------------------------------------------------------------------------
@@ -823,7 +979,7 @@ class MainWindow(QWidget):
 
         val = max(val, 0)
         val = min(val, 100)
-        self.qlin_setpoint.setText("%u" % val)
+        self.qlin_setpoint.setText(f"{val:d}")
         self.ard_qdev.state.setpoint = val
 
     @QtCore.pyqtSlot()
@@ -846,6 +1002,19 @@ class MainWindow(QWidget):
         self.qpbt_burst_incr_RH.setEnabled(flag)
         self.qpbt_burst_decr_RH.setEnabled(flag)
 
+    @QtCore.pyqtSlot(bool)
+    def process_qchk_setpoint(self, checked: bool):
+        self.curve_deadband_HI.setVisible(checked)
+        self.curve_deadband_LO.setVisible(checked)
+
+    @QtCore.pyqtSlot(str)
+    def process_recording_started(self, filepath: str):
+        self.qpbt_record.setText(f"Recording to file: {filepath}")
+
+    @QtCore.pyqtSlot()
+    def process_recording_stopped(self):
+        self.qpbt_record.setText("Click to start recording to file")
+
     @QtCore.pyqtSlot(bool)
     def process_qchk_incr_ENA_valve_1(self, checked: bool):
         self.ard_qdev.config.actors_incr_RH.ENA_valve_1 = checked
@@ -886,7 +1055,7 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.fineband_dLO
 
         val = -(abs(val))
-        self.qlin_fineband_dLO.setText("%+.1f" % val)
+        self.qlin_fineband_dLO.setText(f"{val:+.1f}")
         self.ard_qdev.config.fineband_dLO = val
 
     @QtCore.pyqtSlot()
@@ -897,7 +1066,7 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.fineband_dHI
 
         val = max(val, 0)
-        self.qlin_fineband_dHI.setText("%+.1f" % val)
+        self.qlin_fineband_dHI.setText(f"{val:+.1f}")
         self.ard_qdev.config.fineband_dHI = val
 
     @QtCore.pyqtSlot()
@@ -908,7 +1077,7 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.deadband_dLO
 
         val = -(abs(val))
-        self.qlin_deadband_dLO.setText("%+.1f" % val)
+        self.qlin_deadband_dLO.setText(f"{val:+.1f}")
         self.ard_qdev.config.deadband_dLO = val
 
     @QtCore.pyqtSlot()
@@ -919,9 +1088,28 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.deadband_dHI
 
         val = max(val, 0)
-        self.qlin_deadband_dHI.setText("%+.1f" % val)
+        self.qlin_deadband_dHI.setText(f"{val:+.1f}")
         self.ard_qdev.config.deadband_dHI = val
 
+    @QtCore.pyqtSlot()
+    def process_qlin_band_hysteresis(self):
+        try:
+            val = float(self.qlin_band_hysteresis.text())
+        except ValueError:
+            val = self.ard_qdev.config.band_hysteresis
+
+        # Must stay smaller than the gaps between the dead- and fine-band edges,
+        # or else the widened dead-band would swallow the fine-band
+        config = self.ard_qdev.config
+        val = min(
+            abs(val),
+            config.fineband_dHI - config.deadband_dHI,
+            config.deadband_dLO - config.fineband_dLO,
+        )
+        val = max(val, 0)
+        self.qlin_band_hysteresis.setText(f"{val:.1f}")
+        self.ard_qdev.config.band_hysteresis = val
+
     @QtCore.pyqtSlot()
     def process_qlin_burst_update_period(self):
         try:
@@ -930,7 +1118,7 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.burst_update_period
 
         val = max(val, 1)
-        self.qlin_burst_update_period.setText("%u" % val)
+        self.qlin_burst_update_period.setText(f"{val:d}")
         self.ard_qdev.config.burst_update_period = val
 
     @QtCore.pyqtSlot()
@@ -941,7 +1129,7 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.burst_incr_RH_length
 
         val = max(val, 500)
-        self.qlin_burst_incr_RH_length.setText("%u" % val)
+        self.qlin_burst_incr_RH_length.setText(f"{val:d}")
         self.ard_qdev.config.burst_incr_RH_length = val
 
     @QtCore.pyqtSlot()
@@ -952,9 +1140,21 @@ class MainWindow(QWidget):
             val = self.ard_qdev.config.burst_decr_RH_length
 
         val = max(val, 500)
-        self.qlin_burst_decr_RH_length.setText("%u" % val)
+        self.qlin_burst_decr_RH_length.setText(f"{val:d}")
         self.ard_qdev.config.burst_decr_RH_length = val
 
+    @QtCore.pyqtSlot()
+    def process_qpbt_load_config(self):
+        self.load_config_from_file(from_default=False)
+
+    @QtCore.pyqtSlot()
+    def process_qpbt_save_config(self):
+        self.save_config_to_file(as_default=False)
+
+    @QtCore.pyqtSlot()
+    def process_qpbt_dflt_config(self):
+        self.save_config_to_file(as_default=True)
+
     # --------------------------------------------------------------------------
     #   Configuration files
     # --------------------------------------------------------------------------
@@ -963,26 +1163,12 @@ class MainWindow(QWidget):
         config = self.ard_qdev.config  # Shorthand
 
         cp = ConfigParser()
-        cp.optionxform = lambda option: option  # Preserve letter case
+        cp.optionxform = str  # Preserve letter case
 
         descr = "Humidistat"
         cp.add_section(descr)
-        tmp = config.actors_incr_RH
-        cp.set(descr, "actors_incr_RH_ENA_valve_1", str(tmp.ENA_valve_1))
-        cp.set(descr, "actors_incr_RH_ENA_valve_2", str(tmp.ENA_valve_2))
-        cp.set(descr, "actors_incr_RH_ENA_pump", str(tmp.ENA_pump))
-        tmp = config.actors_decr_RH
-        cp.set(descr, "actors_decr_RH_ENA_valve_1", str(tmp.ENA_valve_1))
-        cp.set(descr, "actors_decr_RH_ENA_valve_2", str(tmp.ENA_valve_2))
-        cp.set(descr, "actors_decr_RH_ENA_pump", str(tmp.ENA_pump))
-        cp.set(descr, "act_on_sensor_no", str(config.act_on_sensor_no))
-        cp.set(descr, "fineband_dHI", str(config.fineband_dHI))
-        cp.set(descr, "fineband_dLO", str(config.fineband_dLO))
-        cp.set(descr, "deadband_dHI", str(config.deadband_dHI))
-        cp.set(descr, "deadband_dLO", str(config.deadband_dLO))
-        cp.set(descr, "burst_update_period", str(config.burst_update_period))
-        cp.set(descr, "burst_incr_RH_length", str(config.burst_incr_RH_length))
-        cp.set(descr, "burst_decr_RH_length", str(config.burst_decr_RH_length))
+        for option, attr_path, _ in CONFIG_FIELDS:
+            cp.set(descr, option, str(attrgetter(attr_path)(config)))
 
         if as_default:
             fn = DEFAULT_CONFIG_FILE
@@ -991,22 +1177,23 @@ class MainWindow(QWidget):
                 "humidistat_config_%s.ini"
                 % QDateTime.currentDateTime().toString("yyMMdd_HHmmss")
             )
-            options = QFileDialog.Options()
-            # options |= QFileDialog.DontUseNativeDialog
             fn, _ = QFileDialog.getSaveFileName(
                 self,
                 caption="Save Humidistat configuration to file",
                 directory=suggested_name,
                 filter="Configuration files (*.ini);;All Files (*)",
-                options=options,
+                options=self.FILE_DIALOG_OPTIONS,
             )
             if not fn:
                 return
 
+        # Serialize in memory first, so that the file gets written in one go
+        buf = StringIO()
+        cp.write(buf)
+
         fn = Path(fn)
         try:
-            with open(fn, "w") as f:
-                cp.write(f)
+            fn.write_text(buf.getvalue())
         except Exception as err:  # pylint: disable=broad-except
             dprint("ERROR: Failed to write configuration to file")
             pft(err)
@@ -1019,14 +1206,12 @@ class MainWindow(QWidget):
         if from_default:
             fn = DEFAULT_CONFIG_FILE
         else:  # Ask user for filename
-            options = QFileDialog.Options()
-            # options |= QFileDialog.DontUseNativeDialog
             fn, _ = QFileDialog.getOpenFileName(
                 self,
                 caption="Load Humidistat configuration from file",
                 directory="",
                 filter="Configuration files (*.ini);;All Files (*)",
-                options=options,
+                options=self.FILE_DIALOG_OPTIONS,
             )
             if not fn:
                 return
@@ -1042,36 +1227,20 @@ class MainWindow(QWidget):
 
         try:
             descr = "Humidistat"
-            config.actors_incr_RH.ENA_valve_1 = cp.getboolean(
-                descr, "actors_incr_RH_ENA_valve_1"
-            )
-            config.actors_incr_RH.ENA_valve_2 = cp.getboolean(
-                descr, "actors_incr_RH_ENA_valve_2"
-            )
-            config.actors_incr_RH.ENA_pump = cp.getboolean(
-                descr, "actors_incr_RH_ENA_pump"
-            )
-            config.actors_decr_RH.ENA_valve_1 = cp.getboolean(
-                descr, "actors_decr_RH_ENA_valve_1"
-            )
-            config.actors_decr_RH.ENA_valve_2 = cp.getboolean(
-                descr, "actors_decr_RH_ENA_valve_2"
-            )
-            config.actors_decr_RH.ENA_pump = cp.getboolean(
-                descr, "actors_decr_RH_ENA_pump"
-            )
-            config.act_on_sensor_no = cp.getint(descr, "act_on_sensor_no")
-            config.fineband_dHI = cp.getfloat(descr, "fineband_dHI")
-            config.fineband_dLO = cp.getfloat(descr, "fineband_dLO")
-            config.deadband_dHI = cp.getfloat(descr, "deadband_dHI")
-            config.deadband_dLO = cp.getfloat(descr, "deadband_dLO")
-            config.burst_update_period = cp.getint(descr, "burst_update_period")
-            config.burst_incr_RH_length = cp.getint(
-                descr, "burst_incr_RH_length"
-            )
-            config.burst_decr_RH_length = cp.getint(
-                descr, "burst_decr_RH_length"
-            )
+            getters = {
+                bool: cp.getboolean,
+                int: cp.getint,
+                float: cp.getfloat,
+            }
+            for option, attr_path, type_ in CONFIG_FIELDS:
+                if option in CONFIG_OPTIONAL and not cp.has_option(
+                    descr, option
+                ):
+                    continue
+
+                obj_path, _, attr = attr_path.rpartition(".")
+                obj = attrgetter(obj_path)(config) if obj_path else config
+                setattr(obj, attr, getters[type_](descr, option))
         except Exception as err:  # pylint: disable=broad-except
             dprint("ERROR: Failed to load configuration from file")
             pft(err)
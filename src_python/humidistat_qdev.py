@@ -12,6 +12,7 @@ __version__ = "1.1"
 
 from enum import Enum
 import numpy as np
+from PyQt5 import QtCore
 
 from dvg_devices.Arduino_protocol_serial import Arduino
 from dvg_qdeviceio import QDeviceIO, DAQ_TRIGGER
@@ -32,6 +33,8 @@ class Actuators:
     """Holds which actuators to enable to either increase or decrease the
     humidity. Hence, two instances of this class should be created."""
 
+    __slots__ = ("ENA_valve_1", "ENA_valve_2", "ENA_pump")
+
     def __init__(
         self, valve_1: bool = False, valve_2: bool = False, pump: bool = False
     ):
@@ -42,6 +45,24 @@ class Actuators:
 
 class Humidistat_qdev(QDeviceIO):
     class State(object):
+        __slots__ = (
+            "time",
+            "valve_1",
+            "valve_2",
+            "pump",
+            "temp_1",
+            "temp_2",
+            "humi_1",
+            "humi_2",
+            "pres_1",
+            "pres_2",
+            "setpoint",
+            "control_mode",
+            "control_band",
+            "control_band_prev",
+            "burst_timer",
+        )
+
         def __init__(self):
             # Actual readings of the Arduino
             self.time = np.nan  # [s]
@@ -60,9 +81,23 @@ class Humidistat_qdev(QDeviceIO):
             self.control_mode = ControlMode.Manual
             self.control_band = ControlBand.Coarse
             self.control_band_prev = None
-            self.t_burst = 0  # [s], timestamp at start of burst period
+            self.burst_timer = QtCore.QElapsedTimer()  # Time into burst period
 
     class Config(object):
+        __slots__ = (
+            "actors_incr_RH",
+            "actors_decr_RH",
+            "act_on_sensor_no",
+            "fineband_dHI",
+            "fineband_dLO",
+            "deadband_dHI",
+            "deadband_dLO",
+            "band_hysteresis",
+            "burst_update_period",
+            "burst_incr_RH_length",
+            "burst_decr_RH_length",
+        )
+
         def __init__(self):
             # fmt: off
             # Actuators
@@ -71,10 +106,11 @@ class Humidistat_qdev(QDeviceIO):
             self.act_on_sensor_no = 1  # [1 or 2]
 
             # Bandwidths
-            self.fineband_dHI = +2     # [% RH]
-            self.fineband_dLO = -2     # [% RH]
-            self.deadband_dHI = +0.5   # [% RH]
-            self.deadband_dLO = -0.5   # [% RH]
+            self.fineband_dHI = +2      # [% RH]
+            self.fineband_dLO = -2      # [% RH]
+            self.deadband_dHI = +0.5    # [% RH]
+            self.deadband_dLO = -0.5    # [% RH]
+            self.band_hysteresis = 0.2  # [% RH], margin to leave a band
 
             # Fine 'burst' control mode
             self.burst_update_period = 10     # [s]
@@ -110,6 +146,7 @@ class Humidistat_qdev(QDeviceIO):
     #   Arduino communication functions
     # --------------------------------------------------------------------------
 
+    @QtCore.pyqtSlot()
     def reconnect_BME280_sensors(self):
         self.send(self.dev.write, "r")
 
@@ -125,6 +162,18 @@ class Humidistat_qdev(QDeviceIO):
         if not self.state.pump == flag:
             self.send(self.dev.write, "p%u" % flag)
 
+    @QtCore.pyqtSlot()
+    def toggle_valve_1(self):
+        self.set_valve_1(not self.state.valve_1)
+
+    @QtCore.pyqtSlot()
+    def toggle_valve_2(self):
+        self.set_valve_2(not self.state.valve_2)
+
+    @QtCore.pyqtSlot()
+    def toggle_pump(self):
+        self.set_pump(not self.state.pump)
+
     def set_actuators(self, valve_1: bool, valve_2: bool, pump: bool):
         if (
             (not self.state.valve_1 == valve_1)
@@ -133,6 +182,7 @@ class Humidistat_qdev(QDeviceIO):
         ):
             self.send(self.dev.write, "a%u%u%u" % (valve_1, valve_2, pump))
 
+    @QtCore.pyqtSlot()
     def burst_incr_RH(self):
         command = "b%u%u%u%u" % (
             self.config.actors_incr_RH.ENA_valve_1,
@@ -142,6 +192,7 @@ class Humidistat_qdev(QDeviceIO):
         )
         self.send(self.dev.write, command)
 
+    @QtCore.pyqtSlot()
     def burst_decr_RH(self):
         command = "b%u%u%u%u" % (
             self.config.actors_decr_RH.ENA_valve_1,
@@ -16,7 +16,6 @@ import time
 
 from PyQt5 import QtCore
 from PyQt5 import QtWidgets as QtWid
-from PyQt5.QtCore import QDateTime
 
 from dvg_pyqt_filelogger import FileLogger
 from dvg_debug_functions import dprint, print_fancy_traceback as pft
@@ -28,16 +27,31 @@ from humidistat_gui import MainWindow
 # Show debug info in terminal?
 DEBUG = False
 
+# Units and names of the data columns, written once to the log file header
+LOG_DATA_HEADER = (
+    "[s]\t"
+    "[0/1]\t[0/1]\t[0/1]\t"
+    "[±3 pct]\t[±0.5 °C]\t[±1 mbar]\t"
+    "[±3 pct]\t[±0.5 °C]\t[±1 mbar]\n"
+    "time\t"
+    "valve_1\tvalve_2\tpump\t"
+    "humi_1\ttemp_1\tpres_1\t"
+    "humi_2\ttemp_2\tpres_2\n"
+)
+
+# Format of each data line written to the log file
+LOG_DATA_FORMAT = "%.3f\t%u\t%u\t%u\t%.2f\t%.2f\t%.1f\t%.2f\t%.2f\t%.1f\n"
+
 # ------------------------------------------------------------------------------
 #   current_date_time_strings
 # ------------------------------------------------------------------------------
 
 
 def current_date_time_strings():
-    cur_date_time = QDateTime.currentDateTime()
+    cur_date_time = time.localtime()
     return (
-        cur_date_time.toString("dd-MM-yyyy"),  # Date
-        cur_date_time.toString("HH:mm:ss"),  # Time
+        time.strftime("%d-%m-%Y", cur_date_time),  # Date
+        time.strftime("%H:%M:%S", cur_date_time),  # Time
     )
 
 
@@ -91,9 +105,6 @@ def DAQ_function() -> bool:
     state = ard_qdev.state
     config = ard_qdev.config
 
-    # Date-time keeping
-    str_cur_date, str_cur_time = current_date_time_strings()
-
     # Listen to the Arduino for sensor readings send out over serial
     success, reply = ard.readline()
     dprint(reply)
@@ -101,11 +112,20 @@ def DAQ_function() -> bool:
     if not (success):
         dprint(
             "'%s' reports IOError @ %s %s"
-            % (ard.name, str_cur_date, str_cur_time)
+            % (ard.name, *current_date_time_strings())
+        )
+        return False
+
+    # Parse readings into separate state variables. A reply always holds 10
+    # fields, so a truncated or garbled line is caught by its length first.
+    fields = reply.split("\t")
+    if len(fields) != 10:
+        dprint(
+            "'%s' reports malformed reply @ %s %s"
+            % (ard.name, *current_date_time_strings())
         )
         return False
 
-    # Parse readings into separate state variables
     try:
         (
             state.time,
@@ -118,23 +138,24 @@ def DAQ_function() -> bool:
             state.temp_2,
             state.pres_1,
             state.pres_2,
-        ) = list(
-            map(float, reply.split("\t"))
+        ) = map(
+            float, fields
         )  # Parse all as float to allow for "nan" values in the reply string
-        state.valve_1 = bool(state.valve_1)
-        state.valve_2 = bool(state.valve_2)
-        state.pump = bool(state.pump)
-        state.time /= 1000  # Arduino time, [msec] to [s]
-        state.pres_1 /= 100  # [Pa] to [mbar]
-        state.pres_2 /= 100  # [Pa] to [mbar]
-    except Exception as err:
+    except ValueError as err:
         pft(err)
         dprint(
             "'%s' reports IOError @ %s %s"
-            % (ard.name, str_cur_date, str_cur_time)
+            % (ard.name, *current_date_time_strings())
         )
         return False
 
+    state.valve_1 = bool(state.valve_1)
+    state.valve_2 = bool(state.valve_2)
+    state.pump = bool(state.pump)
+    state.time /= 1000  # Arduino time, [msec] to [s]
+    state.pres_1 /= 100  # [Pa] to [mbar]
+    state.pres_2 /= 100  # [Pa] to [mbar]
+
     # We will use PC time instead
     state.time = time.perf_counter()
 
@@ -142,11 +163,25 @@ def DAQ_function() -> bool:
     humi = state.humi_1 if config.act_on_sensor_no == 1 else state.humi_2
     humi_err = humi - state.setpoint
 
-    if (humi_err > config.deadband_dLO) & (humi_err < config.deadband_dHI):
+    # Hysteresis: Widen the band that we are currently in, so that readings
+    # jittering around a band edge do not make the controller flip-flop
+    prev = state.control_band_prev
+    dead_margin = config.band_hysteresis if prev == ControlBand.Dead else 0
+    fine_margin = config.band_hysteresis if prev == ControlBand.Fine else 0
+
+    if (
+        config.deadband_dLO - dead_margin
+        < humi_err
+        < config.deadband_dHI + dead_margin
+    ):
         state.control_band = ControlBand.Dead
         if state.control_band != state.control_band_prev:
             dprint("Control band: DEAD")
-    elif (humi_err > config.fineband_dLO) & (humi_err < config.fineband_dHI):
+    elif (
+        config.fineband_dLO - fine_margin
+        < humi_err
+        < config.fineband_dHI + fine_margin
+    ):
         state.control_band = ControlBand.Fine
         if state.control_band != state.control_band_prev:
             dprint("Control band: FINE")
@@ -174,17 +209,23 @@ def DAQ_function() -> bool:
             if state.control_band != state.control_band_prev:
                 # Restart burst timer as soon as we enter the fine-band and
                 # ensure we turn off all actuators
-                state.t_burst = time.perf_counter()
+                state.burst_timer.start()
                 ard_qdev.set_actuators(False, False, False)
 
-            if time.perf_counter() - state.t_burst > config.burst_update_period:
+            # The timer can still be unstarted when auto control got switched
+            # on while already inside the fine-band
+            if (
+                not state.burst_timer.isValid()
+                or state.burst_timer.elapsed()
+                > config.burst_update_period * 1e3
+            ):
                 # Burst timer fired
                 if humi < state.setpoint:
                     ard_qdev.burst_incr_RH()
                 else:
                     ard_qdev.burst_decr_RH()
 
-                state.t_burst = time.perf_counter()
+                state.burst_timer.start()
 
         else:
             # Dead-band: Turn off all actuators
@@ -192,7 +233,9 @@ def DAQ_function() -> bool:
 
     state.control_band_prev = state.control_band
 
-    # Add readings to chart histories
+    # Add readings to chart histories. HistoryChartCurve guards its buffers
+    # with a mutex and only gets redrawn by the GUI thread in `update_charts`,
+    # hence `appendData` is safe to call from out of this thread.
     window.curve_humi_1.appendData(state.time, state.humi_1)
     window.curve_temp_1.appendData(state.time, state.temp_1)
     window.curve_pres_1.appendData(state.time, state.pres_1)
@@ -221,29 +264,21 @@ def DAQ_function() -> bool:
 
 def write_header_to_log():
     str_cur_date, str_cur_time = current_date_time_strings()
-    logger.write("[HEADER]\n")
-    logger.write(str_cur_date + "\n")
-    logger.write(str_cur_time + "\n")
-    logger.write(window.qtxt_comments.toPlainText())
-    logger.write("\n\n[DATA]\n")
-    logger.write(
-        "[s]\t"
-        "[0/1]\t[0/1]\t[0/1]\t"
-        "[±3 pct]\t[±0.5 °C]\t[±1 mbar]\t"
-        "[±3 pct]\t[±0.5 °C]\t[±1 mbar]\n"
-    )
     logger.write(
-        "time\t"
-        "valve_1\tvalve_2\tpump\t"
-        "humi_1\ttemp_1\tpres_1\t"
-        "humi_2\ttemp_2\tpres_2\n"
+        "[HEADER]\n%s\n%s\n%s\n\n[DATA]\n%s"
+        % (
+            str_cur_date,
+            str_cur_time,
+            window.qtxt_comments.toPlainText(),
+            LOG_DATA_HEADER,
+        )
     )
 
 
 def write_data_to_log():
     state = ard_qdev.state  # Shorthand
     logger.write(
-        "%.3f\t%u\t%u\t%u\t%.2f\t%.2f\t%.1f\t%.2f\t%.2f\t%.1f\n"
+        LOG_DATA_FORMAT
         % (
             logger.elapsed(),
             state.valve_1,